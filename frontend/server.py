@@ -174,13 +174,13 @@ def api_state(game_id: str) -> Dict[str, Any]:
     players = []
     
     for i, (agent_id, agent) in enumerate(engine.agents_by_id.items()):
-        is_president = agent_id == engine.president_rotation[engine.current_president_idx]
+        is_president = agent_id == engine.president_rotation[0]
         
         # Only show chancellor if there's an active chancellor AND they're not the same as president
         current_chancellor = engine.current_chancellor_id or most_recent_chancellor
         is_chancellor = (current_chancellor and 
                         agent_id == current_chancellor and 
-                        agent_id != engine.president_rotation[engine.current_president_idx])
+                        agent_id != engine.president_rotation[0])
         
         # Additional check: if we're in nomination phase (no current chancellor), clear chancellor titles
         if not engine.current_chancellor_id:
@@ -6,7 +6,11 @@ from ..models import (
     MessageHistory,
     AssistantResponse,
 )
-from ..model_converters import BaseModelConverterFactory, ModelConverterFactoryRegistry
+from ..model_converters import (
+    BaseModelConverterFactory,
+    MessageHistoryRenderer,
+    ModelConverterFactoryRegistry,
+)
 from ..env import settings
 from ..models import Agent
 from functools import wraps
@@ -180,14 +184,9 @@ class BaseAgent(ABC):
         )
         self.model_converter_factory = model_converter_factory or new_model_factory
 
-        self.user_input_converter = (
-            self.model_converter_factory.create_user_input_converter()
-        )
-        self.tool_feedback_converter = (
-            self.model_converter_factory.create_tool_feedback_converter()
-        )
+        self.message_renderer = MessageHistoryRenderer(self.model_converter_factory)
         self.assistant_response_converter = (
-            self.model_converter_factory.create_assistant_response_converter()
+            self.message_renderer.assistant_response_converter
         )
 
     @abstractmethod
@@ -201,18 +200,4 @@ class BaseAgent(ABC):
     def _convert_message_history(
         self, message_history: list[MessageHistory]
     ) -> list[dict]:
-        return [
-            item
-            for message in message_history
-            for item in self._convert_history_item(message)
-        ]
-
-    def _convert_history_item(self, message: MessageHistory) -> list[dict]:
-        if message.history_type == "user-input":
-            return self.user_input_converter.to_list_dict(message)
-        elif message.history_type == "tool-feedback":
-            return self.tool_feedback_converter.to_list_dict(message)
-        elif message.history_type == "assistant-response":
-            return self.assistant_response_converter.to_list_dict(message)
-        else:
-            raise ValueError(f"Unknown message history type: {message}")
+        return self.message_renderer.render(message_history)
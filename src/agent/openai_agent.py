@@ -1,3 +1,8 @@
+import asyncio
+import hashlib
+import json
+import weakref
+from collections import OrderedDict
 from typing import cast, Any
 from .base_agent import BaseAgent, log_messages
 from ..models import AIModel, MessageHistory, AssistantResponse, Backend, Agent
@@ -8,6 +13,67 @@ from ..tools import generate_tools
 from ..env import settings
 
 
+# One limiter per event loop; a semaphore can't be shared across loops
+_request_slots: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Semaphore
+] = weakref.WeakKeyDictionary()
+
+
+def _request_slot() -> asyncio.Semaphore:
+    """Process-wide cap on concurrent completions, shared by every agent and game."""
+    loop = asyncio.get_running_loop()
+    slot = _request_slots.get(loop)
+    if slot is None:
+        slot = asyncio.Semaphore(settings.llm.max_concurrency)
+        _request_slots[loop] = slot
+    return slot
+
+
+# Clients (and their connection pools) are shared per event loop and endpoint,
+# so every agent in every game reuses the same keep-alive connections
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, str], AsyncOpenAI]
+] = weakref.WeakKeyDictionary()
+
+
+def _shared_client(api_key: str, base_url: str) -> AsyncOpenAI:
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get((api_key, base_url))
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=settings.llm.max_retries,
+        )
+        clients[(api_key, base_url)] = client
+    return client
+
+
+# Exact-match memo of completions, shared by every agent in the process.
+# Disabled unless llm.response_cache_size > 0: with sampling, identical prompts
+# are expected to get different answers.
+_response_cache: OrderedDict[str, AssistantResponse] = OrderedDict()
+
+
+def _response_cache_key(model: str | None, messages: list[dict], tools: list[dict]) -> str:
+    payload = json.dumps([model, messages, tools], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _window_messages(messages: list[dict], max_messages: int) -> list[dict]:
+    """
+    Keep the first message (the game rules) and roughly the last max_messages
+    messages. The window never opens on a tool result, whose assistant tool
+    call would otherwise be cut off.
+    """
+    if len(messages) <= max_messages + 1:
+        return messages
+    start = len(messages) - max_messages
+    while start < len(messages) and messages[start]["role"] == "tool":
+        start += 1
+    return [messages[0], *messages[start:]]
+
+
 class OpenAIAgent(BaseAgent):
     backend = Backend.OPENAI
 
@@ -31,7 +97,11 @@ class OpenAIAgent(BaseAgent):
 
         self.api_key = self.api_key or settings.openai.api_key
         self.base_url = self.base_url or settings.openai.base_url
-        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        # Looked up per call: agents may be built outside the loop that runs them
+        return _shared_client(self.api_key, self.base_url)
 
     @log_messages
     async def generate_response(
@@ -41,12 +111,12 @@ class OpenAIAgent(BaseAgent):
         eligible_agent_ids: list[str] | None = None,
     ) -> AssistantResponse:
         converted_history = self._convert_message_history(message_history)
+        if settings.llm.max_history_messages > 0:
+            converted_history = _window_messages(
+                converted_history, settings.llm.max_history_messages
+            )
 
-        tools = generate_tools(allowed_tools, eligible_agent_ids)
-        
-        # Add reasoning field as first parameter to all tools
-        from src.engine.protocol import add_reasoning_to_tool_schema
-        tools = [add_reasoning_to_tool_schema(tool) for tool in tools]
+        tools = generate_tools(allowed_tools, eligible_agent_ids, with_reasoning=True)
 
         # DEBUG: Print message history to identify the issue
         # print("=== MESSAGE HISTORY BEING SENT TO OPENAI ===")
@@ -61,12 +131,21 @@ class OpenAIAgent(BaseAgent):
         #     print(f"  Content: {str(msg.get('content', 'N/A'))[:100]}")
         # print("=== END MESSAGE HISTORY ===")
 
-        response = await self.client.chat.completions.create(
-            model=self.ai_model,
-            messages=cast(list[ChatCompletionMessageParam], converted_history),
-            tools=cast(list[ChatCompletionToolParam], tools),
-            tool_choice="required",
-        )
+        cache_key = None
+        if settings.llm.response_cache_size > 0:
+            cache_key = _response_cache_key(self.ai_model, converted_history, tools)
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                _response_cache.move_to_end(cache_key)
+                return cached
+
+        async with _request_slot():
+            response = await self.client.chat.completions.create(
+                model=self.ai_model,
+                messages=cast(list[ChatCompletionMessageParam], converted_history),
+                tools=cast(list[ChatCompletionToolParam], tools),
+                tool_choice="required",
+            )
 
         assistant_response = self.assistant_response_converter.from_dict(
             data=response.model_dump()
@@ -77,4 +156,9 @@ class OpenAIAgent(BaseAgent):
             :1
         ]
 
+        if cache_key is not None:
+            _response_cache[cache_key] = assistant_response
+            if len(_response_cache) > settings.llm.response_cache_size:
+                _response_cache.popitem(last=False)
+
         return assistant_response
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import random
-import uuid
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from itertools import count, islice
 from asyncio import Queue
-from typing import cast
+from typing import BinaryIO, cast
 import json
 from src.models import (
     Agent,
@@ -31,15 +34,22 @@ from src.models import (
     EngineEvent,
     MessageHistory,
 )
-from src.engine.protocol import ModelInput, ToolCallTarget, TerminalState
+from src.engine.protocol import (
+    ModelInput,
+    ToolCallTarget,
+    TerminalState,
+)
+from src.model_converters import MessageHistoryRenderer, ModelConverterFactoryRegistry
 from src.agent import BaseAgent
 from src.engine.deck import Deck
 from src.agent.agent_registry import AgentRegistry
 from src.engine.external_agent_response_parser import ExternalAgentResponseParser
 from src.models import Tools
-from src.engine.prompts import get_base_game_rules_prompt, get_strategic_game_prompt
+from src.engine.prompts import get_strategic_game_prompt
 from src.tools import generate_tools
 
+LOG_FLUSH_EVERY = 32
+
 ROLES = [
     AgentRole.MASTER_IMPOSTOR,
     AgentRole.IMPOSTOR,
@@ -62,10 +72,37 @@ def get_backend_for_model(ai_model: AIModel | None) -> Backend:
     return Backend.OPENAI
 
 
+def _encode_log_record(record: dict) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+
+def _write_all(fp: BinaryIO, data: bytes) -> None:
+    # Raw (unbuffered) files may write only part of the data per call
+    view = memoryview(data)
+    while view:
+        view = view[fp.write(view):]
+
+
 class AgentNotFoundError(Exception):
     """Raised when the engine receives a request for an unknown agent id."""
 
 
+@asynccontextmanager
+async def _task_group() -> AsyncIterator[asyncio.TaskGroup]:
+    """
+    asyncio.TaskGroup that re-raises a lone failure as itself, so callers
+    (e.g. EngineAPI's AgentNotFoundError handling) see the original exception
+    instead of an ExceptionGroup wrapping it.
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            yield tg
+    except ExceptionGroup as group:
+        if len(group.exceptions) == 1:
+            raise group.exceptions[0] from None
+        raise
+
+
 class Engine:
     def __init__(
         self,
@@ -76,6 +113,9 @@ class Engine:
         game_id: str,
         log_file: str | None = None,
         trainable_impostor_prob: float = 0.6,  # Probability trainable agent is Impostor/Master
+        short_circuit_votes: bool = False,  # Cancel outstanding AI votes once the outcome is settled
+        pipeline_discourse: bool = False,  # Answer directed questions before the ask round finishes
+        seed: int | None = None,  # Seeds role assignment, seating and speaker order
     ) -> None:
         self.deck = deck
         self.sabotage_track_target = sabotage_protocols_to_win
@@ -83,6 +123,12 @@ class Engine:
         self.promotion_threshold = sabotage_protocols_to_win // 2
         self.game_id = game_id
         self.log_file = log_file
+        self.short_circuit_votes = short_circuit_votes
+        self.pipeline_discourse = pipeline_discourse
+        # Per-game RNG, so concurrent games never share the global random state
+        self._rng = random.Random(seed)
+        # History timestamps only need to be unique and ordered within a game
+        self._ts_seq = count(1)
 
         if len(ai_models) != len(ROLES):
             raise ValueError(
@@ -98,15 +144,15 @@ class Engine:
         trainable_idx = next((i for i, model in enumerate(ai_models) if model is None), None)
 
         # Assign roles with optional oversampling for trainable agent
-        if trainable_idx is not None and random.random() < trainable_impostor_prob:
+        if trainable_idx is not None and self._rng.random() < trainable_impostor_prob:
             # Force trainable agent to be on the Impostor team
             impostor_roles = [AgentRole.MASTER_IMPOSTOR, AgentRole.IMPOSTOR]
-            trainable_role = random.choice(impostor_roles)
+            trainable_role = self._rng.choice(impostor_roles)
             
             # Remaining roles for other agents
             remaining_roles = list(ROLES)
             remaining_roles.remove(trainable_role)
-            random.shuffle(remaining_roles)
+            self._rng.shuffle(remaining_roles)
             
             # Build role assignment
             shuffled_roles = []
@@ -119,7 +165,7 @@ class Engine:
                     remaining_idx += 1
         else:
             # Standard uniform shuffle
-            shuffled_roles = random.sample(ROLES, len(ROLES))
+            shuffled_roles = self._rng.sample(ROLES, len(ROLES))
 
         agent_ids = [f"agent_{i}" for i in range(len(ai_models))]
         agents = []
@@ -141,65 +187,92 @@ class Engine:
 
         self.agents_by_id: dict[str, Agent] = {a.agent_id: a for a in agents}
 
-        self.president_rotation: list[str] = random.sample(agent_ids, len(agent_ids))
-        self.current_president_idx: int = 0
+        # Roles never change after assignment, so resolve the team lookups once
+        self._master_impostor_id: str | None = next(
+            (a.agent_id for a in agents if a.role == AgentRole.MASTER_IMPOSTOR), None
+        )
+        self._impostor_agents: tuple[Agent, ...] = tuple(
+            a for a in agents if a.role in (AgentRole.MASTER_IMPOSTOR, AgentRole.IMPOSTOR)
+        )
+        self._crewmate_agents: tuple[Agent, ...] = tuple(
+            a for a in agents if a.role == AgentRole.CREWMATE
+        )
+
+        # The current president is always at the front; rotate(-1) moves the
+        # role to the next agent
+        self.president_rotation: deque[str] = deque(
+            self._rng.sample(agent_ids, len(agent_ids))
+        )
         self.current_chancellor_id: str | None = None
         self.sabotage_progress: int = 0
         self.security_progress: int = 0
         self.failed_election_tracker: int = 0
         self.event_counter: int = 0
-        self.public_events: list = []
-        self.private_events_by_agent: dict[str, list] = {aid: [] for aid in agent_ids}
-        self.last_seen_event_counter: dict[str, int] = {aid: -1 for aid in agent_ids}
+        self.public_events: list[EngineEvent] = []
+        self.private_events_by_agent: dict[str, list[EngineEvent]] = {
+            aid: [] for aid in agent_ids
+        }
+        # Per-agent read offsets into the (append-only) event lists
+        self._public_event_idx: dict[str, int] = {aid: 0 for aid in agent_ids}
+        self._private_event_idx: dict[str, int] = {aid: 0 for aid in agent_ids}
 
         self.ai_agents: dict[str, BaseAgent] = {}
         self.msg_history: dict[str, list[MessageHistory]] = {
             aid: [] for aid in agent_ids
         }
         self.em_dash_counts: dict[str, int] = {aid: 0 for aid in agent_ids}
-        system_prompt = self._build_system_prompt()
+
+        # Background state logger, started by run() when log_file is set
+        self._log_fp: BinaryIO | None = None
+        self._log_queue: Queue[dict] | None = None
+        self._log_task: asyncio.Task | None = None
+        self._logged_public_count = 0
+        self._logged_private_counts: dict[str, int] = {aid: 0 for aid in agent_ids}
+        self._logged_scalar_state: dict | None = None
+        # Invariant pieces of every prompt, formatted once per game
+        self._system_prompt = self._build_system_prompt()
+        self._agent_ids: tuple[str, ...] = tuple(self.agents_by_id)
+        self._agent_ids_repr = str(list(self._agent_ids))
+        self._shared_game_state_key: tuple | None = None
+        self._shared_game_state_text = ""
+        # At most one list per (president, previous chancellor) pair
+        self._eligible_chancellors: dict[tuple[str, str | None], tuple[str, ...]] = {}
+        self._role_by_agent: dict[str, AgentRole] = {
+            aid: a.role for aid, a in self.agents_by_id.items()
+        }
         print(
             f"[Engine] Initialized game {self.game_id[:8]} with agents: "
             f"{', '.join(f'{a.agent_id}:{a.role.value}' for a in agents)} | "
             f"trainable={self.trainable_agent_id}"
         )
 
-        # Dedicated renderer to convert policy agent history to OpenAI format
-        self._policy_message_renderer: BaseAgent | None = None
+        # Renderer for the policy agent's history in OpenAI format. History is
+        # append-only, so rendered messages are cached and only new entries
+        # are converted on each request.
+        self._policy_message_renderer: MessageHistoryRenderer | None = None
         if self.policy_agent_id is not None:
-            self._policy_message_renderer = AgentRegistry.create_agent(
-                backend=Backend.OPENAI,
-                agent=Agent(
-                    agent_id="policy-renderer",
-                    role=AgentRole.CREWMATE,
-                    ai_model=AIModel.OPENAI_GPT_5_NANO,
-                ),
-                ai_model=AIModel.OPENAI_GPT_5_NANO,
+            self._policy_message_renderer = MessageHistoryRenderer(
+                ModelConverterFactoryRegistry.create_factory(backend=Backend.OPENAI)
             )
-
+        self._rendered_policy_messages: list[dict] = []
+        self._rendered_policy_history_len = 0
+
+        # History entries are only ever read, so every agent shares one
+        # system prompt message. Like every history entry and event the engine
+        # builds from already-typed values, it skips pydantic validation.
+        system_prompt_input = UserInput.model_construct(
+            history_type="user-input",
+            user_message=self._system_prompt,
+            timestamp=self._next_ts(),
+        )
         for aid, agent in self.agents_by_id.items():
-            if agent.is_policy:
-                # Still track history but inference handled externally
-                self.msg_history[aid].append(
-                    UserInput(
-                        history_type="user-input",
-                        user_message=system_prompt,
-                        timestamp=str(uuid.uuid4()),
-                    )
+            # The policy agent still tracks history, but inference is external
+            if not agent.is_policy:
+                backend = get_backend_for_model(agent.ai_model)
+                self.ai_agents[aid] = AgentRegistry.create_agent(
+                    backend=backend, agent=agent, ai_model=agent.ai_model
                 )
-                continue
-
-            backend = get_backend_for_model(agent.ai_model)
-            self.ai_agents[aid] = AgentRegistry.create_agent(
-                backend=backend, agent=agent, ai_model=agent.ai_model
-            )
-            self.msg_history[aid].append(
-                UserInput(
-                    history_type="user-input",
-                    user_message=system_prompt,
-                    timestamp=str(uuid.uuid4()),
-                )
-            )
+            self.msg_history[aid].append(system_prompt_input)
 
     def _generate_terminal_state(self) -> TerminalState:
         winners = self._get_winners()
@@ -225,16 +298,20 @@ class Engine:
         )
 
     async def run(self, input_queue: Queue, output_queue: Queue) -> None:
+        self._start_log_writer()
+        try:
+            await self._run_game(input_queue, output_queue)
+            self._log_full_state_to_file()
+        finally:
+            await self._stop_log_writer()
+
+    async def _run_game(self, input_queue: Queue, output_queue: Queue) -> None:
         while not self._is_game_over():
-            president_id = self.president_rotation[self.current_president_idx]
+            president_id = self.president_rotation[0]
 
-            eligible_chancellor_ids = [
-                aid
-                for aid in self.agents_by_id.keys()
-                if aid != president_id and aid != self.current_chancellor_id
-            ]
+            eligible_chancellor_ids = self._eligible_chancellor_ids(president_id)
 
-            tool = cast(
+            nomination = cast(
                 PresidentPickChancellorTool,
                 await self._get_tool(
                     president_id,
@@ -245,140 +322,109 @@ class Engine:
                     eligible_agent_ids=eligible_chancellor_ids,
                 ),
             )
-            chancellor_id = tool.agent_id
-            self.public_events.append(
-                PresidentPickChancellorEventPublic(
-                    event_order_counter=self.event_counter,
-                    president_id=president_id,
-                    chancellor_id=chancellor_id,
-                )
+            chancellor_id = nomination.agent_id
+            self._emit_public(
+                PresidentPickChancellorEventPublic,
+                president_id=president_id,
+                chancellor_id=chancellor_id,
             )
-            self.event_counter += 1
-            # await self._log_state_to_file()
+            self._log_state_to_file()
 
             await self._discourse(input_queue, output_queue)
-            # await self._log_state_to_file()
 
             if not await self._vote(chancellor_id, input_queue, output_queue):
                 self.failed_election_tracker += 1
-                # await self._log_state_to_file()
 
                 if self.failed_election_tracker >= 3:
                     self._handle_failed_election()
-                    # await self._log_state_to_file()
 
-                self.current_president_idx = (self.current_president_idx + 1) % len(
-                    self.president_rotation
-                )
-                # await self._log_state_to_file()
+                self.president_rotation.rotate(-1)
+                self._log_state_to_file()
                 continue
 
             self.failed_election_tracker = 0
             self.current_chancellor_id = chancellor_id
-            # await self._log_state_to_file()
+            self._log_state_to_file()
 
-            cards_raw = self.deck.draw(3)
+            cards = self.deck.draw(3)
             # Assign unique IDs to each card for tracking (frontend use only)
-            cards_with_ids = [
-                {"id": f"card_{self.event_counter}_{i}", "type": card}
-                for i, card in enumerate(cards_raw)
-            ]
-            
-            tool = cast(
+            card_ids = [f"card_{self.event_counter}_{i}" for i in range(len(cards))]
+
+            discard = cast(
                 PresidentChooseCardToDiscardTool,
                 await self._get_tool(
                     president_id,
-                    f"Cards: {cards_raw}. Discard index (0-2).",
+                    f"Cards: {cards}. Discard index (0-2).",
                     input_queue,
                     output_queue,
                     allowed_tools=["president-choose-card-to-discard"],
                 ),
             )
-            idx = tool.card_index
-            discarded_card = cards_with_ids.pop(idx)
-            self.deck.add_to_discard(discarded_card["type"])
-
-            # Reconstruct cards_drawn with discarded card at original position
-            all_cards_with_ids = cards_with_ids[:idx] + [discarded_card] + cards_with_ids[idx:]
-            
-            # Create the event with simple card types for the model
-            event = PresidentChooseCardToDiscardEventPrivate(
-                event_order_counter=self.event_counter,
+            idx = discard.card_index
+            # The two cards passed to the chancellor, in drawn order. pop()
+            # resolves the index exactly like the list lookup, negatives included.
+            passed_cards = list(cards)
+            passed_card_ids = list(card_ids)
+            discarded_card = passed_cards.pop(idx)
+            discarded_card_id = passed_card_ids.pop(idx)
+            self.deck.add_to_discard(discarded_card)
+
+            event = self._emit_private(
+                president_id,
+                PresidentChooseCardToDiscardEventPrivate,
                 president_id=president_id,
-                cards_drawn=[c["type"] for c in all_cards_with_ids],
-                card_discarded=discarded_card["type"],
+                cards_drawn=cards,
+                card_discarded=discarded_card,
             )
             # Attach card ID data as extra attribute for frontend serialization
-            event.__dict__["_cards_with_ids"] = all_cards_with_ids
-            event.__dict__["_discarded_card_id"] = discarded_card["id"]
-            self.private_events_by_agent[president_id].append(event)
-            self.event_counter += 1
-            # await self._log_state_to_file()
-
-            # cards_with_ids now contains the 2 cards passed to chancellor
-            cards_types = [c["type"] for c in cards_with_ids]
-            
-            tool = cast(
+            event.__dict__["_cards_with_ids"] = [
+                {"id": card_id, "type": card} for card_id, card in zip(card_ids, cards)
+            ]
+            event.__dict__["_discarded_card_id"] = discarded_card_id
+
+            play = cast(
                 ChancellorPlayPolicyTool,
                 await self._get_tool(
                     chancellor_id,
-                    f"Cards: {cards_types}. Play index (0-1).",
+                    f"Cards: {passed_cards}. Play index (0-1).",
                     input_queue,
                     output_queue,
                     allowed_tools=["chancellor-play-policy"],
                 ),
             )
-            idx = tool.card_index
-            played_card = cards_with_ids[idx]
-            discarded_by_chancellor_card = cards_with_ids[1 - idx]
-            played = played_card["type"]
-            self.deck.add_to_discard(discarded_by_chancellor_card["type"])
-
-            # Create the event with simple card types for the model
-            event = ChancellorReceivePoliciesEventPrivate(
-                event_order_counter=self.event_counter,
+            idx = play.card_index
+            played = passed_cards[idx]
+            discarded_by_chancellor = passed_cards[1 - idx]
+            self.deck.add_to_discard(discarded_by_chancellor)
+
+            event = self._emit_private(
+                chancellor_id,
+                ChancellorReceivePoliciesEventPrivate,
                 chancellor_id=chancellor_id,
                 president_id_received_from=president_id,
-                cards_received=[c["type"] for c in cards_with_ids],
-                card_discarded=discarded_by_chancellor_card["type"],
+                cards_received=passed_cards,
+                card_discarded=discarded_by_chancellor,
             )
             # Attach card ID data as extra attribute for frontend serialization
-            event.__dict__["_cards_with_ids"] = cards_with_ids
-            event.__dict__["_discarded_card_id"] = discarded_by_chancellor_card["id"]
-            self.private_events_by_agent[chancellor_id].append(event)
-            self.event_counter += 1
-            self.public_events.append(
-                ChancellorPlayPolicyEventPublic(
-                    event_order_counter=self.event_counter,
-                    chancellor_id=chancellor_id,
-                    card_played=played,
-                )
-            )
-            self.event_counter += 1
-            # await self._log_state_to_file()
-
-            if played == PolicyCard.SABOTAGE:
-                self.sabotage_progress += 1
-            else:
-                self.security_progress += 1
+            event.__dict__["_cards_with_ids"] = [
+                {"id": card_id, "type": card}
+                for card_id, card in zip(passed_card_ids, passed_cards)
+            ]
+            event.__dict__["_discarded_card_id"] = passed_card_ids[1 - idx]
+            self._enact_policy(played, chancellor_id)
+            self._log_state_to_file()
 
             await self._discourse(input_queue, output_queue)
-            # await self._log_state_to_file()
 
-            self.current_president_idx = (self.current_president_idx + 1) % len(
-                self.president_rotation
-            )
-            # await self._log_state_to_file()
+            self.president_rotation.rotate(-1)
+            self._log_state_to_file()
 
         # Game is over, generate the terminal state
         terminal_state = self._generate_terminal_state()
         
         # Get the policy agent's final message history
-        if self.policy_agent_id is not None and self._policy_message_renderer is not None:
-            policy_message_history = self.msg_history[self.policy_agent_id]
-            final_messages = self._policy_message_renderer._convert_message_history(
-                policy_message_history
-            )
+        if self.policy_agent_id is not None:
+            final_messages = self._render_policy_messages()
         else:
             final_messages = []
         
@@ -398,235 +444,329 @@ class Engine:
         allowed_tools: list[str] | None = None,
         eligible_agent_ids: list[str] | None = None,
     ) -> Tools:
-        if agent_id not in self.agents_by_id:
-            raise AgentNotFoundError(
-                f"Unknown agent_id '{agent_id}' in game {self.game_id}. "
-                f"Known agents: {list(self.agents_by_id.keys())}"
-            )
-        agent = self.agents_by_id[agent_id]
-        new_user_inputs = self._get_new_user_events_since_last_message(
-            agent_id, prompt_guidance
+        self._check_agent_exists(agent_id)
+        history = self.msg_history[agent_id]
+        history.extend(
+            self._get_new_user_events_since_last_message(agent_id, prompt_guidance)
         )
 
-        for user_input in new_user_inputs:
-            self.msg_history[agent_id].append(user_input)
-
-        if self.policy_agent_id is not None and agent_id == self.policy_agent_id:
+        if agent_id == self.policy_agent_id:
             # This is the policy agent being trained - get external input
-            tool_schema = generate_tools(allowed_tools, eligible_agent_ids)
-            assert len(tool_schema) == 1
-            assert allowed_tools is not None and len(allowed_tools) == 1
-            tool_name = allowed_tools[0]
-            tool_schema = tool_schema[0]
-            
-            # Add reasoning field as first parameter
-            from src.engine.protocol import add_reasoning_to_tool_schema
-            tool_schema = add_reasoning_to_tool_schema(tool_schema)
-
-            tool_call_target = ToolCallTarget(
-                name=tool_name,
-                openai_schema=tool_schema,
-            )
-
-            # Convert message history to messages for the policy agent
-            message_history = self.msg_history[agent_id]
-            messages = self._policy_message_renderer._convert_message_history(
-                message_history
+            await output_queue.put(
+                self._build_policy_model_input(allowed_tools, eligible_agent_ids)
             )
-
-            model_input = ModelInput(
-                messages=messages,
-                tool_call=tool_call_target,
-                terminal_state=None,
+            response = ExternalAgentResponseParser.parse(
+                await input_queue.get(), self._next_ts()
             )
-
-            await output_queue.put(model_input)
-            response = ExternalAgentResponseParser.parse(await input_queue.get())
-            self.msg_history[agent_id].append(response)
         else:
             # This is an opponent agent controlled by AI
-            response = await self.ai_agents[agent_id].generate_response(
-                self.msg_history[agent_id],
-                allowed_tools=allowed_tools,
-                eligible_agent_ids=eligible_agent_ids,
+            try:
+                response = await self.ai_agents[agent_id].generate_response(
+                    history,
+                    allowed_tools=allowed_tools,
+                    eligible_agent_ids=eligible_agent_ids,
+                )
+            except asyncio.CancelledError:
+                # A request cancelled once its vote was decided must not leave
+                # an unanswered action prompt; the events before it stay seen
+                history.pop()
+                raise
+            # Restamp into the game's sequence; a copy, since cached responses
+            # may be shared between games
+            response = response.model_copy(update={"timestamp": self._next_ts()})
+        history.append(response)
+
+        tool_call_results = [
+            ToolResult.model_construct(
+                tool_call_id=tool_call.tool_call_id,
+                tool_name=tool_call.tool_name,
+                output="OK",
             )
-            self.msg_history[agent_id].append(response)
-
-        feedback = ToolFeedback(
+            for tool_call in response.tool_calls  # Create response for ALL tool calls
+        ]
+        feedback = ToolFeedback.model_construct(
             history_type="tool-feedback",
-            tool_call_results=[
-                ToolResult(
-                    tool_call_id=tool_call.tool_call_id,
-                    tool_name=tool_call.tool_name,
-                    output="OK",
-                )
-                for tool_call in response.tool_calls  # Create response for ALL tool calls
-            ],
-            timestamp=str(uuid.uuid4()),
+            tool_call_results=tool_call_results,
+            timestamp=self._next_ts(),
         )
-        self.msg_history[agent_id].append(feedback)
+        history.append(feedback)
 
         return response.hydrated_tool_calls[0]
 
-    async def _discourse(self, input_queue: Queue, output_queue: Queue) -> None:
-        # Parallelize AI agents, but handle trainable agent outside gather to avoid deadlock
-        ai_tasks = []
-        trainable_aid = None
-
-        for aid in self.agents_by_id:
-            if self.agents_by_id[aid].ai_model is None:
-                trainable_aid = aid
-            else:
-                ai_tasks.append(self._get_tool(
-                    aid,
-                    "Speak? (question/statement or null)",
-                    input_queue,
-                    output_queue,
-                    allowed_tools=["ask-agent-if-wants-to-speak"],
-                ))
-
-        # Get AI agent responses in parallel
-        ai_tools = await asyncio.gather(*ai_tasks)
-
-        # Get trainable agent response separately
-        trainable_tool = None
-        if trainable_aid:
-            trainable_tool = await self._get_tool(
-                trainable_aid,
-                "Speak? (question/statement or null)",
-                input_queue,
-                output_queue,
-                allowed_tools=["ask-agent-if-wants-to-speak"],
-            )
+    def _build_policy_model_input(
+        self,
+        allowed_tools: list[str] | None,
+        eligible_agent_ids: list[str] | None,
+    ) -> ModelInput:
+        """ModelInput for the external worker, once the policy agent's history is up to date."""
+        assert allowed_tools is not None and len(allowed_tools) == 1
+        tool_name = allowed_tools[0]
+
+        # The external worker's schema carries the reasoning field too
+        tools = generate_tools(allowed_tools, eligible_agent_ids, with_reasoning=True)
+        assert len(tools) == 1
+        tool_call_target = ToolCallTarget(name=tool_name, openai_schema=tools[0])
+
+        return ModelInput(
+            messages=self._render_policy_messages(),
+            tool_call=tool_call_target,
+            terminal_state=None,
+        )
 
-        # Reconstruct tools in original order
-        tools = []
-        ai_idx = 0
-        for aid in self.agents_by_id:
-            if aid == trainable_aid:
-                tools.append(trainable_tool)
-            else:
-                tools.append(ai_tools[ai_idx])
-                ai_idx += 1
+    async def _discourse(self, input_queue: Queue, output_queue: Queue) -> None:
+        # Ask every agent (including the trainable one) in parallel; the task
+        # group cancels the remaining requests if any of them fails
+        async with _task_group() as tg:
+            tasks = [
+                tg.create_task(
+                    self._get_tool(
+                        aid,
+                        "Speak? (question/statement or null)",
+                        input_queue,
+                        output_queue,
+                        allowed_tools=["ask-agent-if-wants-to-speak"],
+                    )
+                )
+                for aid in self._agent_ids
+            ]
+            pipelined_answers: dict[str, asyncio.Task] = {}
+            if self.pipeline_discourse:
+                ask_tasks = dict(zip(self._agent_ids, tasks))
+                answer_locks = {aid: asyncio.Lock() for aid in self._agent_ids}
+                pipelined_answers = {
+                    aid: tg.create_task(
+                        self._answer_when_asked(
+                            aid, ask_tasks, answer_locks, input_queue, output_queue
+                        )
+                    )
+                    for aid in self._agent_ids
+                }
+        tools = [cast(AskAgentIfWantsToSpeakTool, task.result()) for task in tasks]
+
+        speakers: list[tuple[str, AskAgentIfWantsToSpeakTool]] = [
+            (aid, tool)
+            for aid, tool in zip(self._agent_ids, tools)
+            if tool.question_or_statement
+        ]
+
+        self._rng.shuffle(speakers)
+
+        self._emit_public_many(
+            AskAgentIfWantsToSpeakEventPublic,
+            [
+                {
+                    "agent_id": aid,
+                    "question_or_statement": tool.question_or_statement,
+                    "ask_directed_question_to_agent_id": tool.ask_directed_question_to_agent_id,
+                }
+                for aid, tool in speakers
+            ],
+        )
+        for aid, tool in speakers:
+            self._track_emdashes(aid, tool.question_or_statement)
 
-        speakers = []
-        for aid, tool in zip(self.agents_by_id.keys(), tools):
-            tool = cast(AskAgentIfWantsToSpeakTool, tool)
-            if tool.question_or_statement:
-                speakers.append((aid, tool))
+            target = tool.ask_directed_question_to_agent_id
+            if target:
+                # Fail before any answer is requested from the other targets
+                self._check_agent_exists(target)
 
-        random.shuffle(speakers)
+        if self.pipeline_discourse:
+            answers = {aid: task.result() for aid, task in pipelined_answers.items()}
+        else:
+            answers = await self._answer_directed_questions_by_target(
+                speakers, input_queue, output_queue
+            )
 
         for aid, tool in speakers:
-            self.public_events.append(
-                AskAgentIfWantsToSpeakEventPublic(
-                    event_order_counter=self.event_counter,
-                    agent_id=aid,
-                    question_or_statement=tool.question_or_statement,
-                    ask_directed_question_to_agent_id=tool.ask_directed_question_to_agent_id,
-                )
+            target = tool.ask_directed_question_to_agent_id
+            if not target:
+                continue
+            resp = answers[aid]
+            self._emit_public(
+                AgentResponseToQuestioningEventPublic,
+                agent_id=target,
+                in_response_to_agent_id=aid,
+                response=resp.response,
             )
-            self.event_counter += 1
 
-            self._track_emdashes(aid, tool.question_or_statement)
+            self._track_emdashes(target, resp.response)
 
-            if tool.ask_directed_question_to_agent_id:
-                target = tool.ask_directed_question_to_agent_id
-                resp = cast(
-                    AgentResponseToQuestionTool,
-                    await self._get_tool(
-                        target,
-                        f"Asked: {tool.question_or_statement}. Respond.",
-                        input_queue,
-                        output_queue,
-                        allowed_tools=["agent-response-to-question-tool"],
-                    ),
-                )
-                self.public_events.append(
-                    AgentResponseToQuestioningEventPublic(
-                        event_order_counter=self.event_counter,
-                        agent_id=target,
-                        in_response_to_agent_id=aid,
-                        response=resp.response,
+    async def _answer_directed_questions_by_target(
+        self,
+        speakers: list[tuple[str, AskAgentIfWantsToSpeakTool]],
+        input_queue: Queue,
+        output_queue: Queue,
+    ) -> dict[str, AgentResponseToQuestionTool]:
+        """Answer every published directed question, keyed by the asking agent."""
+        questions_by_target: dict[str, list[AskAgentIfWantsToSpeakTool]] = {}
+        for _, tool in speakers:
+            target = tool.ask_directed_question_to_agent_id
+            if target:
+                questions_by_target.setdefault(target, []).append(tool)
+
+        # Answers can't see each other, so different targets respond in
+        # parallel. Questions to the same target stay sequential to keep its
+        # history (and the trainable agent's queue lockstep) in order.
+        async with _task_group() as tg:
+            answer_tasks = {
+                target: tg.create_task(
+                    self._answer_directed_questions(
+                        target, questions, input_queue, output_queue
                     )
                 )
-                self.event_counter += 1
+                for target, questions in questions_by_target.items()
+            }
+        answers_by_target = {
+            target: iter(task.result()) for target, task in answer_tasks.items()
+        }
+        # Each target answered its questions in speaker order
+        return {
+            aid: next(answers_by_target[tool.ask_directed_question_to_agent_id])
+            for aid, tool in speakers
+            if tool.ask_directed_question_to_agent_id
+        }
 
-                self._track_emdashes(target, resp.response)
+    async def _answer_when_asked(
+        self,
+        asker_id: str,
+        ask_tasks: dict[str, asyncio.Task],
+        answer_locks: dict[str, asyncio.Lock],
+        input_queue: Queue,
+        output_queue: Queue,
+    ) -> AgentResponseToQuestionTool | None:
+        """
+        Answer asker_id's directed question as soon as it has been asked,
+        without waiting for the rest of the ask round.
 
-    def _handle_failed_election(self) -> None:
-        top_card = self.deck.draw(1)[0]
-        self.public_events.append(
-            ChancellorPlayPolicyEventPublic(
-                event_order_counter=self.event_counter,
-                chancellor_id=None,
-                card_played=top_card,
+        The target's own ask must have returned and its other answers are
+        serialized, so no agent ever has two requests in flight. Unknown
+        targets are left for _discourse to reject after the round.
+        """
+        tool = cast(AskAgentIfWantsToSpeakTool, await ask_tasks[asker_id])
+        target = tool.ask_directed_question_to_agent_id
+        if not tool.question_or_statement or target not in ask_tasks:
+            return None
+        await ask_tasks[target]
+        async with answer_locks[target]:
+            # The ask isn't public yet, so the prompt itself names the asker
+            return cast(
+                AgentResponseToQuestionTool,
+                await self._get_tool(
+                    target,
+                    f"{asker_id} asked you: {tool.question_or_statement}. Respond.",
+                    input_queue,
+                    output_queue,
+                    allowed_tools=["agent-response-to-question-tool"],
+                ),
             )
+
+    async def _answer_directed_questions(
+        self,
+        target: str,
+        questions: list[AskAgentIfWantsToSpeakTool],
+        input_queue: Queue,
+        output_queue: Queue,
+    ) -> list[AgentResponseToQuestionTool]:
+        responses = []
+        for tool in questions:
+            resp = cast(
+                AgentResponseToQuestionTool,
+                await self._get_tool(
+                    target,
+                    f"Asked: {tool.question_or_statement}. Respond.",
+                    input_queue,
+                    output_queue,
+                    allowed_tools=["agent-response-to-question-tool"],
+                ),
+            )
+            responses.append(resp)
+        return responses
+
+    def _handle_failed_election(self) -> None:
+        self._enact_policy(self.deck.draw(1)[0], None)
+        self.failed_election_tracker = 0
+
+    def _enact_policy(self, card: PolicyCard, chancellor_id: str | None) -> None:
+        """Publish a played policy and advance its track."""
+        self._emit_public(
+            ChancellorPlayPolicyEventPublic,
+            chancellor_id=chancellor_id,
+            card_played=card,
         )
-        self.event_counter += 1
-        if top_card == PolicyCard.SABOTAGE:
+        if card == PolicyCard.SABOTAGE:
             self.sabotage_progress += 1
         else:
             self.security_progress += 1
-        self.failed_election_tracker = 0
 
     async def _vote(
         self, chancellor_id: str, input_queue: Queue, output_queue: Queue
     ) -> bool:
-        # Parallelize AI agents, but handle trainable agent outside gather to avoid deadlock
-        ai_tasks = []
-        trainable_aid = None
-
-        for aid in self.agents_by_id:
-            if self.agents_by_id[aid].ai_model is None:
-                trainable_aid = aid
-            else:
-                ai_tasks.append(self._get_tool(
-                    aid,
-                    f"Vote on Chancellor {chancellor_id}? (true/false)",
-                    input_queue,
-                    output_queue,
-                    allowed_tools=["vote-chancellor-yes-no"],
-                ))
-
-        # Get AI agent responses in parallel
-        ai_tools = await asyncio.gather(*ai_tasks)
-
-        # Get trainable agent response separately
-        trainable_tool = None
-        if trainable_aid:
-            trainable_tool = await self._get_tool(
-                trainable_aid,
-                f"Vote on Chancellor {chancellor_id}? (true/false)",
-                input_queue,
-                output_queue,
-                allowed_tools=["vote-chancellor-yes-no"],
+        # Collect every vote (including the trainable agent's) in parallel; the
+        # task group cancels the remaining requests if any of them fails
+        async with _task_group() as tg:
+            tasks = {
+                aid: tg.create_task(
+                    self._get_tool(
+                        aid,
+                        f"Vote on Chancellor {chancellor_id}? (true/false)",
+                        input_queue,
+                        output_queue,
+                        allowed_tools=["vote-chancellor-yes-no"],
+                    )
+                )
+                for aid in self._agent_ids
+            }
+            if self.short_circuit_votes:
+                await self._cancel_votes_once_decided(tasks)
+
+        yes_count = 0
+        vote_events = []
+        for aid, task in tasks.items():
+            # Votes cancelled by the short circuit are not cast
+            if task.cancelled():
+                continue
+            tool = cast(VoteChancellorYesNoTool, task.result())
+            yes_count += tool.choice
+            vote_events.append(
+                {
+                    "voter_id": aid,
+                    "chancellor_nominee_id": chancellor_id,
+                    "vote": tool.choice,
+                }
             )
+        self._emit_public_many(VoteChancellorYesNoEventPublic, vote_events)
+        return yes_count > len(tasks) // 2
 
-        # Reconstruct tools in original order
-        tools = []
-        ai_idx = 0
-        for aid in self.agents_by_id:
-            if aid == trainable_aid:
-                tools.append(trainable_tool)
-            else:
-                tools.append(ai_tools[ai_idx])
-                ai_idx += 1
-
-        votes = []
-        for aid, tool in zip(self.agents_by_id.keys(), tools):
-            tool = cast(VoteChancellorYesNoTool, tool)
-            votes.append(tool.choice)
-            self.public_events.append(
-                VoteChancellorYesNoEventPublic(
-                    event_order_counter=self.event_counter,
-                    voter_id=aid,
-                    chancellor_nominee_id=chancellor_id,
-                    vote=tool.choice,
-                )
+    async def _cancel_votes_once_decided(self, tasks: dict[str, asyncio.Task]) -> None:
+        """
+        Wait for votes until the election result can no longer change, then
+        cancel the AI agents' outstanding requests.
+
+        The trainable agent's request is never cancelled: its ModelInput may
+        already be with the external worker, and dropping the reply would break
+        the queue lockstep.
+        """
+        yes_needed = len(tasks) // 2 + 1
+        max_no = len(tasks) - yes_needed
+        yes_count = no_count = 0
+        pending = set(tasks.values())
+        while pending and yes_count < yes_needed and no_count <= max_no:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
             )
-            self.event_counter += 1
-        return sum(votes) > len(votes) // 2
+            for task in done:
+                if task.exception() is not None:
+                    # Leave it to the task group to cancel the rest and raise
+                    return
+                vote = cast(VoteChancellorYesNoTool, task.result())
+                if vote.choice:
+                    yes_count += 1
+                else:
+                    no_count += 1
+
+        for aid, task in tasks.items():
+            if aid != self.policy_agent_id:
+                task.cancel()
 
     def _is_game_over(self) -> bool:
         return (
@@ -636,13 +776,10 @@ class Engine:
         )
 
     def _master_impostor_promoted(self) -> bool:
-        if self.sabotage_progress < self.promotion_threshold:
-            return False
-        if self.current_chancellor_id is None:
-            return False
         return (
-            self.agents_by_id[self.current_chancellor_id].role
-            == AgentRole.MASTER_IMPOSTOR
+            self.sabotage_progress >= self.promotion_threshold
+            and self.current_chancellor_id is not None
+            and self.current_chancellor_id == self._master_impostor_id
         )
 
     def _get_winners(self) -> list[Agent]:
@@ -650,17 +787,9 @@ class Engine:
             self.sabotage_progress >= self.sabotage_track_target
             or self._master_impostor_promoted()
         ):
-            return [
-                agent
-                for agent in self.agents_by_id.values()
-                if agent.role in [AgentRole.MASTER_IMPOSTOR, AgentRole.IMPOSTOR]
-            ]
+            return list(self._impostor_agents)
         else:
-            return [
-                agent
-                for agent in self.agents_by_id.values()
-                if agent.role == AgentRole.CREWMATE
-            ]
+            return list(self._crewmate_agents)
 
     def _build_system_prompt(self) -> str:
         rules_prompt = get_strategic_game_prompt(
@@ -683,6 +812,69 @@ class Engine:
         - Note: referencing some other agent in your AskAgentIfWantsToSpeakTool or responding in AgentResponseToQuestionTool are completely public and should not be used for private communication
         """
 
+    def _render_policy_messages(self) -> list[dict]:
+        """Render the policy agent's history, converting only entries added since the last call."""
+        assert self.policy_agent_id is not None
+        assert self._policy_message_renderer is not None
+        history = self.msg_history[self.policy_agent_id]
+        self._rendered_policy_messages.extend(
+            self._policy_message_renderer.render(
+                islice(history, self._rendered_policy_history_len, None)
+            )
+        )
+        self._rendered_policy_history_len = len(history)
+        return self._rendered_policy_messages
+
+    def _emit_public(self, event_cls: type[EngineEvent], **fields) -> EngineEvent:
+        """Record a public event under the next event counter."""
+        counter = self.event_counter
+        event = event_cls.model_construct(event_order_counter=counter, **fields)
+        self.public_events.append(event)
+        self.event_counter = counter + 1
+        return event
+
+    def _emit_public_many(
+        self, event_cls: type[EngineEvent], fields_list: list[dict]
+    ) -> None:
+        """Record a batch of public events under consecutive event counters."""
+        start = self.event_counter
+        events = [
+            event_cls.model_construct(event_order_counter=start + i, **fields)
+            for i, fields in enumerate(fields_list)
+        ]
+        self.public_events.extend(events)
+        self.event_counter = start + len(events)
+
+    def _emit_private(
+        self, agent_id: str, event_cls: type[EngineEvent], **fields
+    ) -> EngineEvent:
+        """Record an event visible only to agent_id under the next event counter."""
+        counter = self.event_counter
+        event = event_cls.model_construct(event_order_counter=counter, **fields)
+        self.private_events_by_agent[agent_id].append(event)
+        self.event_counter = counter + 1
+        return event
+
+    def _eligible_chancellor_ids(self, president_id: str) -> list[str]:
+        """Agents the president may nominate, in seating order."""
+        key = (president_id, self.current_chancellor_id)
+        eligible = self._eligible_chancellors.get(key)
+        if eligible is None:
+            eligible = tuple(aid for aid in self._agent_ids if aid not in key)
+            self._eligible_chancellors[key] = eligible
+        # A fresh list, so callers can't mutate the memoized entry
+        return list(eligible)
+
+    def _check_agent_exists(self, agent_id: str) -> None:
+        if agent_id not in self.agents_by_id:
+            raise AgentNotFoundError(
+                f"Unknown agent_id '{agent_id}' in game {self.game_id}. "
+                f"Known agents: {list(self._agent_ids)}"
+            )
+
+    def _next_ts(self) -> str:
+        return str(next(self._ts_seq))
+
     def _track_emdashes(self, agent_id: str, text: str | None) -> None:
         if not text:
             return
@@ -691,55 +883,123 @@ class Engine:
     def _get_new_user_events_since_last_message(
         self, agent_id: str, action_prompt: str
     ) -> list[UserInput]:
-        agent = self.agents_by_id[agent_id]
         user_inputs = []
 
-        all_events: list[EngineEvent] = (
-            self.public_events + self.private_events_by_agent[agent_id]
-        )
-        all_events_sorted = sorted(all_events, key=lambda e: e.event_order_counter)
-
-        last_seen = self.last_seen_event_counter[agent_id]
-        new_events = [e for e in all_events_sorted if e.event_order_counter > last_seen]
-
-        for event in new_events:
+        # Both lists are append-only and already ordered by event_order_counter,
+        # so merge the unseen tails instead of re-sorting the full history
+        public_events = self.public_events
+        private_events = self.private_events_by_agent[agent_id]
+        public_idx = self._public_event_idx[agent_id]
+        private_idx = self._private_event_idx[agent_id]
+        public_end = len(public_events)
+        private_end = len(private_events)
+
+        while public_idx < public_end or private_idx < private_end:
+            if private_idx >= private_end or (
+                public_idx < public_end
+                and public_events[public_idx].event_order_counter
+                < private_events[private_idx].event_order_counter
+            ):
+                event = public_events[public_idx]
+                public_idx += 1
+            else:
+                event = private_events[private_idx]
+                private_idx += 1
             user_inputs.append(
-                UserInput(
+                UserInput.model_construct(
                     history_type="user-input",
-                    user_message=str(event),
-                    timestamp=str(uuid.uuid4()),
+                    user_message=event.rendered,
+                    timestamp=self._next_ts(),
                 )
             )
 
-        if new_events:
-            self.last_seen_event_counter[agent_id] = new_events[-1].event_order_counter
+        self._public_event_idx[agent_id] = public_idx
+        self._private_event_idx[agent_id] = private_idx
 
         game_state = f"""
         === GAME STATE ===
         Your Agent ID: {agent_id}
-        Your Role: {agent.role}
-        Current Captain: {self.president_rotation[self.current_president_idx]}
-        Current First Mate: {self.current_chancellor_id if self.current_chancellor_id else "None"}
-        Sabotage Progress: {self.sabotage_progress}/{self.sabotage_track_target}
-        Security Progress: {self.security_progress}/{self.security_track_target}
-        Failed Assignments: {self.failed_election_tracker}/3 (at 3, the top event auto-resolves)
-
-        All Agents: {list(self.agents_by_id.keys())}
-        """
+        Your Role: {self._role_by_agent[agent_id]}
+        {self._shared_game_state()}"""
 
         action_str = f"\n=== ACTION REQUIRED ===\n{action_prompt}\n"
         user_inputs.append(
-            UserInput(
+            UserInput.model_construct(
                 history_type="user-input",
                 user_message=game_state + action_str,
-                timestamp=str(uuid.uuid4()),
+                timestamp=self._next_ts(),
             )
         )
 
         return user_inputs
 
-    async def _log_state_to_file(self) -> None:
-        if not self.log_file:
+    def _shared_game_state(self) -> str:
+        """The part of the GAME STATE block that is the same for every agent."""
+        key = (
+            self.president_rotation[0],
+            self.current_chancellor_id,
+            self.sabotage_progress,
+            self.security_progress,
+            self.failed_election_tracker,
+        )
+        # Every agent in a vote or discourse round sees the same state, so the
+        # block is only re-formatted when one of its values has changed
+        if key != self._shared_game_state_key:
+            self._shared_game_state_key = key
+            self._shared_game_state_text = f"""Current Captain: {self.president_rotation[0]}
+        Current First Mate: {self.current_chancellor_id if self.current_chancellor_id else "None"}
+        Sabotage Progress: {self.sabotage_progress}/{self.sabotage_track_target}
+        Security Progress: {self.security_progress}/{self.security_track_target}
+        Failed Assignments: {self.failed_election_tracker}/3 (at 3, the top event auto-resolves)
+
+        All Agents: {self._agent_ids_repr}
+        """
+        return self._shared_game_state_text
+
+    def _log_state_to_file(self) -> None:
+        """Log the scalar game state plus only the events added since the last log."""
+        if self._log_queue is None:
+            return
+
+        # Skip records that would carry no new events and an unchanged state
+        scalar_state = self._scalar_state()
+        if (
+            scalar_state == self._logged_scalar_state
+            and len(self.public_events) == self._logged_public_count
+            and all(
+                len(events) == self._logged_private_counts[aid]
+                for aid, events in self.private_events_by_agent.items()
+            )
+        ):
+            return
+        self._logged_scalar_state = scalar_state
+
+        new_private_events = {}
+        for aid, events in self.private_events_by_agent.items():
+            logged = self._logged_private_counts[aid]
+            if len(events) > logged:
+                new_private_events[aid] = [
+                    event.rendered for event in islice(events, logged, None)
+                ]
+                self._logged_private_counts[aid] = len(events)
+
+        state = {
+            **scalar_state,
+            "new_public_events": [
+                event.rendered
+                for event in islice(self.public_events, self._logged_public_count, None)
+            ],
+            "new_private_events_by_agent": new_private_events,
+        }
+        self._logged_public_count = len(self.public_events)
+
+        # Hand the record to the background writer; the game loop never
+        # waits on disk
+        self._log_queue.put_nowait(state)
+
+    def _log_full_state_to_file(self) -> None:
+        """Log a complete snapshot of the game, for replaying a finished game."""
+        if self._log_queue is None:
             return
 
         state = {
@@ -747,31 +1007,80 @@ class Engine:
                 aid: {"role": agent.role.value, "ai_model": agent.ai_model}
                 for aid, agent in self.agents_by_id.items()
             },
-            "president_rotation": self.president_rotation,
-            "current_president_idx": self.current_president_idx,
+            **self._scalar_state(),
+            "public_events": [event.rendered for event in self.public_events],
+            "private_events_by_agent": {
+                aid: [event.rendered for event in events]
+                for aid, events in self.private_events_by_agent.items()
+            },
+        }
+        self._log_queue.put_nowait(state)
+
+    def _scalar_state(self) -> dict:
+        return {
+            "game_id": self.game_id,
+            "president_rotation": list(self.president_rotation),
+            "current_president_id": self.president_rotation[0],
             "current_chancellor_id": self.current_chancellor_id,
             "sabotage_progress": self.sabotage_progress,
             "security_progress": self.security_progress,
             "failed_election_tracker": self.failed_election_tracker,
-            "public_events": [str(e) for e in self.public_events],
-            "private_events_by_agent": {
-                aid: [str(e) for e in events]
-                for aid, events in self.private_events_by_agent.items()
-            },
         }
 
-        # Use asyncio to write to file without blocking
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            self._write_log,
-            state,
+    def _start_log_writer(self) -> None:
+        if not self.log_file or self._log_task is not None:
+            return
+        # Unbuffered: each write() appends whole records at the end of the
+        # file, so games sharing a log file never interleave partial lines
+        self._log_fp = open(self.log_file, "ab", buffering=0)
+        self._log_queue = asyncio.Queue()
+        self._log_task = asyncio.create_task(self._log_consumer())
+
+    async def _stop_log_writer(self) -> None:
+        if self._log_task is None:
+            return
+        assert self._log_queue is not None and self._log_fp is not None
+        log_task = self._log_task
+        if not log_task.done():
+            # Drain the queued records, unless the writer dies first and
+            # leaves them unfinished
+            drain = asyncio.create_task(self._log_queue.join())
+            try:
+                await asyncio.wait(
+                    (drain, log_task), return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                drain.cancel()
+        error = (
+            log_task.exception()
+            if log_task.done() and not log_task.cancelled()
+            else None
         )
+        log_task.cancel()
+        self._log_task = None
+        self._log_queue = None
+        log_fp, self._log_fp = self._log_fp, None
+        await asyncio.to_thread(log_fp.close)
+        # Report a failed writer rather than lose its records silently. It is
+        # not raised: this runs in run()'s finally, after the terminal state
+        # was sent or while the game's own error is propagating.
+        if error is not None:
+            print(
+                f"[Engine] Log writer for game {self.game_id[:8]} failed; "
+                f"records after the failure were dropped: {error!r}"
+            )
 
-    def _write_log(self, state: dict) -> None:
-        """Helper method to write log synchronously in executor."""
-        if self.log_file is None:
-            return
-        with open(self.log_file, "a") as f:
-            f.write("=" * 60 + "\n")
-            f.write(json.dumps(state, indent=2) + "\n")
+    async def _log_consumer(self) -> None:
+        """Drain logged snapshots into the open log file, writing them in batches on a worker thread."""
+        assert self._log_queue is not None and self._log_fp is not None
+        while True:
+            # One compact JSON record per line, so the log can be streamed
+            # and parsed line by line
+            batch = [_encode_log_record(await self._log_queue.get())]
+            while len(batch) < LOG_FLUSH_EVERY and not self._log_queue.empty():
+                batch.append(_encode_log_record(self._log_queue.get_nowait()))
+            try:
+                await asyncio.to_thread(_write_all, self._log_fp, b"".join(batch))
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
@@ -33,6 +33,9 @@ class EngineAPI:
         security_protocols_to_win: int = 3,
         log_file: str | None = None,
         trainable_impostor_prob: float = 0.6,
+        short_circuit_votes: bool = False,
+        pipeline_discourse: bool = False,
+        seed: int | None = None,
     ) -> ModelInput:
         input_queue: Queue = Queue()
         output_queue: Queue = Queue()
@@ -47,6 +50,9 @@ class EngineAPI:
             game_id=game_id,
             log_file=log_file,
             trainable_impostor_prob=trainable_impostor_prob,
+            short_circuit_votes=short_circuit_votes,
+            pipeline_discourse=pipeline_discourse,
+            seed=seed,
         )
         self.engines[game_id] = engine
 
@@ -63,12 +69,11 @@ class EngineAPI:
         return model_input
 
     async def execute(self, game_id: str, model_output: ModelOutput) -> ModelInput:
-        # First check that the game exists
-        if game_id not in self.games:
+        # Obtain the input queue and output queue for the game, if it exists
+        queues = self.games.get(game_id)
+        if queues is None:
             raise ValueError(f"Game {game_id} not found")
-
-        # Obtain the input queue and output queue for the game
-        input_queue, output_queue = self.games[game_id]
+        input_queue, output_queue = queues
 
         # Then, place the model output on the input queue
         await input_queue.put(model_output)
@@ -104,12 +109,9 @@ class EngineAPI:
             print(f"Engine error: {str(e)}\n\nStack trace:\n{tb}")
             await output_queue.put(f"Engine error: {str(e)}\n\nStack trace:\n{tb}")
         finally:
-            if game_id in self.games:
-                del self.games[game_id]
-            if game_id in self.engines:
-                del self.engines[game_id]
-            if game_id in self.tasks:
-                del self.tasks[game_id]
+            self.games.pop(game_id, None)
+            self.engines.pop(game_id, None)
+            self.tasks.pop(game_id, None)
 
     def get_game_ids(self) -> list[str]:
         return list(self.games.keys())
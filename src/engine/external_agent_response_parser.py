@@ -1,13 +1,35 @@
 import json
 import uuid
-from src.models import AssistantResponse, ToolCall, Tools
+from pydantic import BaseModel
+from src.models import (
+    AssistantResponse,
+    ToolCall,
+    Tools,
+    PresidentPickChancellorTool,
+    VoteChancellorYesNoTool,
+    PresidentChooseCardToDiscardTool,
+    ChancellorPlayPolicyTool,
+    ChooseAgentToVoteOutTool,
+    AskAgentIfWantsToSpeakTool,
+    AgentResponseToQuestionTool,
+)
 from src.engine.protocol import ModelOutput
 
+_TOOL_CLASSES: dict[str, type[BaseModel]] = {
+    "president-pick-chancellor": PresidentPickChancellorTool,
+    "vote-chancellor-yes-no": VoteChancellorYesNoTool,
+    "president-choose-card-to-discard": PresidentChooseCardToDiscardTool,
+    "chancellor-play-policy": ChancellorPlayPolicyTool,
+    "choose-agent-to-vote-out": ChooseAgentToVoteOutTool,
+    "ask-agent-if-wants-to-speak": AskAgentIfWantsToSpeakTool,
+    "agent-response-to-question-tool": AgentResponseToQuestionTool,
+}
+
 
 class ExternalAgentResponseParser:
 
     @staticmethod
-    def parse(model_output: ModelOutput) -> AssistantResponse:
+    def parse(model_output: ModelOutput, timestamp: str) -> AssistantResponse:
         """
         Parse a ModelOutput into an AssistantResponse object.
         
@@ -24,6 +46,9 @@ class ExternalAgentResponseParser:
         If 'reasoning' is present in arguments, it will be extracted and stored
         in AssistantResponse.reasoning (taking precedence over ModelOutput.reasoning).
         The reasoning field is then removed from arguments before tool hydration.
+
+        timestamp comes from the caller, so the response is stamped in the same
+        sequence as the rest of the game's message history.
         """
         # Obtain the function calling JSON and reasoning from the model output
         function_calling_json = model_output.function_calling_json
@@ -58,33 +83,13 @@ class ExternalAgentResponseParser:
             text_response=None,
             tool_calls=[tool_call],
             hydrated_tool_calls=[hydrated_tool],
-            timestamp=str(uuid.uuid4()),
+            timestamp=timestamp,
         )
 
     @staticmethod
     def _hydrate_tool(tool_name: str, arguments: dict) -> Tools:
         """Convert tool name and arguments into a hydrated tool object."""
-        from src.models import (
-            PresidentPickChancellorTool,
-            VoteChancellorYesNoTool,
-            PresidentChooseCardToDiscardTool,
-            ChancellorPlayPolicyTool,
-            ChooseAgentToVoteOutTool,
-            AskAgentIfWantsToSpeakTool,
-            AgentResponseToQuestionTool,
-        )
-
-        tool_map = {
-            "president-pick-chancellor": PresidentPickChancellorTool,
-            "vote-chancellor-yes-no": VoteChancellorYesNoTool,
-            "president-choose-card-to-discard": PresidentChooseCardToDiscardTool,
-            "chancellor-play-policy": ChancellorPlayPolicyTool,
-            "choose-agent-to-vote-out": ChooseAgentToVoteOutTool,
-            "ask-agent-if-wants-to-speak": AskAgentIfWantsToSpeakTool,
-            "agent-response-to-question-tool": AgentResponseToQuestionTool,
-        }
-
-        tool_class = tool_map.get(tool_name)
+        tool_class = _TOOL_CLASSES.get(tool_name)
         if not tool_class:
             raise ValueError(f"Unknown tool name: {tool_name}")
 
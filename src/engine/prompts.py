@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
 def get_base_game_rules_prompt(
     num_players: int,
     sabotage_protocols_to_win: int,
@@ -45,6 +49,7 @@ Impostors win if:
 """
 
 
+@lru_cache(maxsize=32)
 def get_strategic_game_prompt(
     num_players: int,
     sabotage_track_target: int,
@@ -57,6 +62,8 @@ def get_strategic_game_prompt(
 
     total_cards = num_crewmate_cards + num_impostor_cards
     impostor_ratio = num_impostor_cards / total_cards if total_cards else 0.0
+    three_sabotages_pct = (impostor_ratio**3) * 100
+    any_security_pct = (1 - impostor_ratio**3) * 100
 
     return f"""# SECRET IMPOSTOR - STRATEGIC GUIDE
 
@@ -69,7 +76,7 @@ You are playing Secret Impostor, a hidden-role game where the Crew keeps the shi
 ## CREW STRATEGY
 1. **Document everything.** Track nominations, voting patterns, and card claims in a shared mental log.
 2. **Interrogate gently but relentlessly.** Ask Captains/First Mates to declare their draws before the next assignment.
-3. **Use math.** The deck currently holds {num_impostor_cards} Sabotage vs {num_crewmate_cards} Security cards (~{impostor_ratio:.0%} sabotages). "Three sabotages" claims are rare (~{(impostor_ratio**3) * 100:.1f}%).
+3. **Use math.** The deck currently holds {num_impostor_cards} Sabotage vs {num_crewmate_cards} Security cards (~{impostor_ratio:.0%} sabotages). "Three sabotages" claims are rare (~{three_sabotages_pct:.1f}%).
 4. **Control nominations.** Trusted players should rotate through First Mate; don't hand the role to unknowns once {promotion_threshold} sabotages are on the board.
 5. **Vote with context.** Repeatedly approving suspicious teams is a red flag—call it out.
 
@@ -91,8 +98,8 @@ You are playing Secret Impostor, a hidden-role game where the Crew keeps the shi
 - Remember that three consecutive failed votes produce an auto-Event (usually helping Impostors).
 
 ## DECK SNAPSHOT
-- Chance of drawing three sabotages: ~{(impostor_ratio**3) * 100:.1f}%.
-- Chance of seeing at least one Security card in three draws: ~{(1 - impostor_ratio**3) * 100:.1f}%.
+- Chance of drawing three sabotages: ~{three_sabotages_pct:.1f}%.
+- Chance of seeing at least one Security card in three draws: ~{any_security_pct:.1f}%.
 Use these numbers to challenge improbable stories.
 
 Stay analytical, adapt to new evidence, and remember: information is the Crew's weapon, deception is the Impostors'.
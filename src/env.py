@@ -22,9 +22,25 @@ class BackendBaseSettings(BaseModel):
     base_url: str
 
 
+class LLMSettings(BaseModel):
+    # Requests in flight at once across every game in the process
+    max_concurrency: int = 32
+    # Client-side retries (exponential backoff, honouring Retry-After) on
+    # rate limits, timeouts and 5xx responses
+    max_retries: int = 6
+    # Entries in the in-process exact-match completion cache; 0 disables it.
+    # Only useful with deterministic decoding.
+    response_cache_size: int = 0
+    # Sliding window over an AI opponent's history (besides the rules message);
+    # 0 sends the full history. Bounds prompt size in long games at the cost
+    # of upstream prefix-cache hits once the window starts moving.
+    max_history_messages: int = 0
+
+
 class Settings(BaseSettings):
     ai: AISettings
     openai: BackendBaseSettings
+    llm: LLMSettings = LLMSettings()
     model_config = settings_config
 
 
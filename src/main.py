@@ -4,6 +4,7 @@ from src.engine.engine_api import EngineAPI
 from src.engine.deck import Deck
 from src.models import AIModel
 from src.engine.protocol import ModelOutput
+import os
 import uuid
 import asyncio
 
@@ -26,7 +27,8 @@ async def main():
         game_id=game_id,
         deck=deck,
         ai_models=ai_models,
-        log_file="game_log.txt"
+        # Opt-in: set GAME_LOG_FILE to write a JSON-lines log of the game
+        log_file=os.environ.get("GAME_LOG_FILE"),
     )
 
     print("=== GAME STARTED ===")
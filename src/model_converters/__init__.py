@@ -1,6 +1,7 @@
 from .factory_registry import ModelConverterFactoryRegistry
 from .openai.model_converter_factory import OpenAIModelConverterFactory
 from .base_model_converter_factory import BaseModelConverterFactory
+from .message_history_renderer import MessageHistoryRenderer
 
 
 ModelConverterFactoryRegistry.register_factory_class(OpenAIModelConverterFactory)
@@ -8,4 +9,5 @@ ModelConverterFactoryRegistry.register_factory_class(OpenAIModelConverterFactory
 __all__ = [
     "ModelConverterFactoryRegistry",
     "BaseModelConverterFactory",
+    "MessageHistoryRenderer",
 ]
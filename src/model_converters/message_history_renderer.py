@@ -0,0 +1,42 @@
+from collections.abc import Iterable
+
+from ..models import MessageHistory
+from .base_model_converter_factory import BaseModelConverterFactory
+
+
+class MessageHistoryRenderer:
+    """
+    Converts MessageHistory items into a backend's message dicts.
+
+    BaseAgent renders its history through this, and callers without an API
+    client use it directly (e.g. the engine sending the trainable agent's
+    conversation to an external worker).
+    """
+
+    def __init__(self, model_converter_factory: BaseModelConverterFactory) -> None:
+        self.user_input_converter = (
+            model_converter_factory.create_user_input_converter()
+        )
+        self.tool_feedback_converter = (
+            model_converter_factory.create_tool_feedback_converter()
+        )
+        self.assistant_response_converter = (
+            model_converter_factory.create_assistant_response_converter()
+        )
+
+    def render(self, message_history: Iterable[MessageHistory]) -> list[dict]:
+        return [
+            item
+            for message in message_history
+            for item in self.render_item(message)
+        ]
+
+    def render_item(self, message: MessageHistory) -> list[dict]:
+        if message.history_type == "user-input":
+            return self.user_input_converter.to_list_dict(message)
+        elif message.history_type == "tool-feedback":
+            return self.tool_feedback_converter.to_list_dict(message)
+        elif message.history_type == "assistant-response":
+            return self.assistant_response_converter.to_list_dict(message)
+        else:
+            raise ValueError(f"Unknown message history type: {message}")
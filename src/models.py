@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
+from functools import cached_property
 from typing import Literal, Annotated, TypeVar, Generic
 
 
@@ -150,8 +151,16 @@ class PolicyCard(str, Enum):
 
 
 class EngineEvent(BaseModel):
+    # Events are rendered to text once and cached, so they must not change
+    model_config = ConfigDict(frozen=True)
+
     event_order_counter: int
 
+    @cached_property
+    def rendered(self) -> str:
+        """str(self), computed on first use and shared by every prompt and log."""
+        return str(self)
+
 
 class PresidentPickChancellorEventPublic(EngineEvent):
     president_id: str
@@ -1,3 +1,3 @@
-from .tools import generate_tools
+from .tools import add_reasoning_to_tool_schema, generate_tools
 
-__all__ = ["generate_tools"]
+__all__ = ["add_reasoning_to_tool_schema", "generate_tools"]
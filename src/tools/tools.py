@@ -1,9 +1,83 @@
+import copy
 from typing import Any
 
+# Properties whose enum lists the agents the caller may choose from
+_AGENT_ID_PROPERTIES = ("agent_id", "ask_directed_question_to_agent_id")
+
 
 def generate_tools(
     allowed_tools: list[str] | None = None,
     eligible_agent_ids: list[str] | None = None,
+    with_reasoning: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Return the OpenAI tool schemas for the allowed tools.
+
+    Schemas are copied from the templates built at import, so callers own the
+    returned dicts. With with_reasoning, each schema requires a 'reasoning'
+    property ahead of its own parameters.
+    """
+    templates = _REASONING_TOOL_SCHEMAS if with_reasoning else _TOOL_SCHEMAS
+    tool_names = allowed_tools or list(templates)
+    tools = []
+    for name in tool_names:
+        template = templates.get(name)
+        if template is None:
+            continue
+        schema = copy.deepcopy(template)
+        if eligible_agent_ids is not None:
+            properties = schema["function"]["parameters"]["properties"]
+            for prop_name in _AGENT_ID_PROPERTIES:
+                prop = properties.get(prop_name)
+                if prop is not None:
+                    # Nullable properties also accept null to skip
+                    nullable = isinstance(prop["type"], list)
+                    prop["enum"] = list(eligible_agent_ids) + ([None] if nullable else [])
+        tools.append(schema)
+    return tools
+
+
+def add_reasoning_to_tool_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """
+    Add a required 'reasoning' field to a tool schema as the FIRST property.
+    This ensures the model generates reasoning before other parameters.
+    """
+    schema = copy.deepcopy(schema)
+    
+    if "function" in schema and "parameters" in schema["function"]:
+        params = schema["function"]["parameters"]
+        
+        # Get existing properties (or create empty dict)
+        existing_properties = params.get("properties", {})
+        
+        # Create new properties dict with reasoning FIRST
+        new_properties = {
+            "reasoning": {
+                "type": "string",
+                "description": "Explain your reasoning behind the action you are taking. Think step-by-step about why this is the right choice."
+            }
+        }
+        
+        # Add existing properties after reasoning
+        for key, value in existing_properties.items():
+            if key != "reasoning":  # Don't duplicate if already exists
+                new_properties[key] = value
+        
+        params["properties"] = new_properties
+        
+        # Add to required fields
+        if "required" not in params:
+            params["required"] = []
+        
+        if "reasoning" not in params["required"]:
+            params["required"].insert(0, "reasoning")  # Insert at beginning
+    
+    return schema
+
+
+def _build_tools(
+    allowed_tools: list[str] | None = None,
+    eligible_agent_ids: list[str] | None = None,
 ) -> list[dict[str, Any]]:
     tool_schemas = {
         "president-pick-chancellor": {
@@ -155,3 +229,12 @@ def generate_tools(
 
     tool_names = allowed_tools or list(tool_schemas.keys())
     return [tool_schemas[name] for name in tool_names if name in tool_schemas]
+
+
+# Templates without eligible agents; generate_tools fills those in per call
+_TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
+    schema["function"]["name"]: schema for schema in _build_tools()
+}
+_REASONING_TOOL_SCHEMAS: dict[str, dict[str, Any]] = {
+    name: add_reasoning_to_tool_schema(schema) for name, schema in _TOOL_SCHEMAS.items()
+}
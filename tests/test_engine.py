@@ -0,0 +1,316 @@
+import asyncio
+import json
+import os
+import random
+import unittest
+from unittest import mock
+
+os.environ.setdefault("AI_BACKEND", "openai")
+os.environ.setdefault("AI_MODEL_ID", "gpt-5-mini-2025-08-07")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("OPENAI_BASE_URL", "http://localhost:1")
+
+from src.agent.openai_agent import OpenAIAgent
+from src.engine.deck import Deck
+from src.engine.engine import Engine
+from src.engine.engine_api import EngineAPI
+from src.engine.external_agent_response_parser import ExternalAgentResponseParser
+from src.engine.protocol import ModelInput, ModelOutput
+from src.models import (
+    AgentResponseToQuestioningEventPublic,
+    AIModel,
+    ChancellorReceivePoliciesEventPrivate,
+    PresidentChooseCardToDiscardEventPrivate,
+    VoteChancellorYesNoEventPublic,
+)
+
+
+def _arguments(tool_name: str, eligible_agent_ids: list[str]) -> dict:
+    if tool_name == "president-pick-chancellor":
+        return {"agent_id": eligible_agent_ids[0]}
+    if tool_name == "vote-chancellor-yes-no":
+        return {"choice": True}
+    if tool_name == "president-choose-card-to-discard":
+        # Out of the schema's range, but only checked to be an int
+        return {"card_index": -1}
+    if tool_name == "chancellor-play-policy":
+        return {"card_index": 0}
+    if tool_name == "ask-agent-if-wants-to-speak":
+        return {"question_or_statement": None, "ask_directed_question_to_agent_id": None}
+    return {"response": "ok"}
+
+
+async def _scripted_response(
+    self, message_history, allowed_tools=None, eligible_agent_ids=None
+):
+    tool_name = allowed_tools[0]
+    payload = {
+        "tool_name": tool_name,
+        "arguments": _arguments(tool_name, eligible_agent_ids or []),
+    }
+    return ExternalAgentResponseParser.parse(
+        ModelOutput(function_calling_json=json.dumps(payload)), timestamp="0"
+    )
+
+
+def _scripted_agents(
+    votes: dict[str, bool] | None = None,
+    delays: dict[str, float] | None = None,
+    questions: dict[str, tuple[str, str]] | None = None,
+):
+    """
+    generate_response replacement answering per agent: votes maps agent ids
+    to their vote, delays to seconds to wait first, and questions to the
+    (target, question) they ask in discourse.
+    """
+    votes = votes or {}
+    delays = delays or {}
+    questions = questions or {}
+
+    async def generate_response(
+        self, message_history, allowed_tools=None, eligible_agent_ids=None
+    ):
+        agent_id = self.agent.agent_id
+        await asyncio.sleep(delays.get(agent_id, 0))
+        tool_name = allowed_tools[0]
+        arguments = _arguments(tool_name, eligible_agent_ids or [])
+        if tool_name == "vote-chancellor-yes-no":
+            arguments["choice"] = votes.get(agent_id, True)
+        elif tool_name == "ask-agent-if-wants-to-speak" and agent_id in questions:
+            target, question = questions[agent_id]
+            arguments = {
+                "question_or_statement": question,
+                "ask_directed_question_to_agent_id": target,
+            }
+        payload = {"tool_name": tool_name, "arguments": arguments}
+        return ExternalAgentResponseParser.parse(
+            ModelOutput(function_calling_json=json.dumps(payload)), timestamp="0"
+        )
+
+    return generate_response
+
+
+def _engine(**kwargs) -> Engine:
+    return Engine(
+        deck=Deck(),
+        ai_models=[AIModel.OPENAI_GPT_5_MINI] * 5,
+        sabotage_protocols_to_win=4,
+        security_protocols_to_win=3,
+        game_id="test",
+        **kwargs,
+    )
+
+
+def _unanswered_action_prompts(engine: Engine) -> list[str]:
+    """Agents with an action prompt in their history that no response follows."""
+    unanswered = []
+    for aid, history in engine.msg_history.items():
+        for entry, next_entry in zip(history, [*history[1:], None]):
+            if (
+                entry.history_type == "user-input"
+                and "ACTION REQUIRED" in entry.user_message
+                and (
+                    next_entry is None
+                    or next_entry.history_type != "assistant-response"
+                )
+            ):
+                unanswered.append(aid)
+    return unanswered
+
+
+class EngineDiscardTest(unittest.IsolatedAsyncioTestCase):
+    async def test_negative_discard_index_passes_two_cards(self) -> None:
+        api = EngineAPI()
+        deck = Deck()
+        with mock.patch.object(OpenAIAgent, "generate_response", _scripted_response):
+            model_input = await api.create(
+                game_id="negative-discard",
+                deck=deck,
+                ai_models=[AIModel.OPENAI_GPT_5_MINI] * 4 + [None],
+                seed=0,
+            )
+            engine = api.engines["negative-discard"]
+            while model_input.terminal_state is None:
+                tool = model_input.tool_call
+                arguments = _arguments(
+                    tool.name,
+                    tool.openai_schema["function"]["parameters"]["properties"]
+                    .get("agent_id", {})
+                    .get("enum", []),
+                )
+                model_input = await api.execute(
+                    "negative-discard",
+                    ModelOutput(
+                        function_calling_json=json.dumps(
+                            {"tool_name": tool.name, "arguments": arguments}
+                        )
+                    ),
+                )
+                self.assertIsInstance(model_input, ModelInput)
+
+        private_events = [
+            event
+            for events in engine.private_events_by_agent.values()
+            for event in events
+        ]
+        discards = [
+            event
+            for event in private_events
+            if isinstance(event, PresidentChooseCardToDiscardEventPrivate)
+        ]
+        self.assertTrue(discards)
+        for event in discards:
+            self.assertEqual(event.card_discarded, event.cards_drawn[-1])
+        for event in private_events:
+            if isinstance(event, ChancellorReceivePoliciesEventPrivate):
+                self.assertEqual(len(event.cards_received), 2)
+
+        # Every card is in the draw pile, the discard pile or on a track
+        self.assertEqual(
+            len(deck.cards)
+            + len(deck.discard_pile)
+            + engine.sabotage_progress
+            + engine.security_progress,
+            deck.total_sabotage_cards + deck.total_security_cards,
+        )
+
+
+class EngineShortCircuitVotesTest(unittest.IsolatedAsyncioTestCase):
+    async def _vote(self, votes: dict[str, bool]) -> tuple[Engine, bool]:
+        engine = _engine(short_circuit_votes=True, seed=0)
+        # agent_3 and agent_4 only answer long after the majority is in
+        delays = {"agent_3": 60, "agent_4": 60}
+        with mock.patch.object(
+            OpenAIAgent, "generate_response", _scripted_agents(votes, delays)
+        ):
+            elected = await asyncio.wait_for(
+                engine._vote("agent_1", asyncio.Queue(), asyncio.Queue()), 5
+            )
+        return engine, elected
+
+    async def test_majority_yes_cancels_late_votes(self) -> None:
+        engine, elected = await self._vote({"agent_3": False, "agent_4": False})
+
+        self.assertTrue(elected)
+        votes = [
+            event
+            for event in engine.public_events
+            if isinstance(event, VoteChancellorYesNoEventPublic)
+        ]
+        self.assertEqual(
+            [(event.voter_id, event.vote) for event in votes],
+            [("agent_0", True), ("agent_1", True), ("agent_2", True)],
+        )
+        self.assertEqual(_unanswered_action_prompts(engine), [])
+        for aid in ("agent_3", "agent_4"):
+            self.assertNotEqual(
+                engine.msg_history[aid][-1].history_type, "assistant-response"
+            )
+
+    async def test_majority_no_rejects_government(self) -> None:
+        engine, elected = await self._vote(
+            {"agent_0": False, "agent_1": False, "agent_2": False}
+        )
+
+        self.assertFalse(elected)
+        self.assertEqual(_unanswered_action_prompts(engine), [])
+
+    async def test_full_games_leave_no_unanswered_prompts(self) -> None:
+        for seed in range(5):
+            rng = random.Random(seed)
+            agent_ids = [f"agent_{i}" for i in range(5)]
+            votes = {aid: rng.random() < 0.5 for aid in agent_ids}
+            delays = {aid: rng.random() * 0.005 for aid in agent_ids}
+            engine = _engine(short_circuit_votes=True, seed=seed)
+            with mock.patch.object(
+                OpenAIAgent, "generate_response", _scripted_agents(votes, delays)
+            ):
+                await asyncio.wait_for(
+                    engine.run(asyncio.Queue(), asyncio.Queue()), 30
+                )
+            self.assertTrue(engine._is_game_over())
+            self.assertEqual(_unanswered_action_prompts(engine), [])
+
+
+class EnginePipelineDiscourseTest(unittest.IsolatedAsyncioTestCase):
+    async def _discourse(self, pipeline_discourse: bool) -> Engine:
+        engine = _engine(pipeline_discourse=pipeline_discourse, seed=0)
+        questions = {
+            "agent_0": ("agent_1", "Why did you vote yes?"),
+            "agent_2": ("agent_1", "Who do you trust?"),
+        }
+        # agent_3 is slow, so pipelined answers start before its ask returns
+        delays = {"agent_3": 0.05}
+        with mock.patch.object(
+            OpenAIAgent,
+            "generate_response",
+            _scripted_agents(delays=delays, questions=questions),
+        ):
+            await engine._discourse(asyncio.Queue(), asyncio.Queue())
+        return engine
+
+    async def test_answers_match_sequential_discourse(self) -> None:
+        pipelined = await self._discourse(pipeline_discourse=True)
+        sequential = await self._discourse(pipeline_discourse=False)
+
+        self.assertEqual(
+            [event.rendered for event in pipelined.public_events],
+            [event.rendered for event in sequential.public_events],
+        )
+        answers = [
+            event
+            for event in pipelined.public_events
+            if isinstance(event, AgentResponseToQuestioningEventPublic)
+        ]
+        self.assertEqual(
+            sorted((event.agent_id, event.in_response_to_agent_id) for event in answers),
+            [("agent_1", "agent_0"), ("agent_1", "agent_2")],
+        )
+        self.assertEqual(_unanswered_action_prompts(pipelined), [])
+
+    async def test_answer_prompt_names_asker(self) -> None:
+        engine = await self._discourse(pipeline_discourse=True)
+
+        prompts = [
+            entry.user_message
+            for entry in engine.msg_history["agent_1"]
+            if entry.history_type == "user-input"
+        ]
+        for asker_id, question in (
+            ("agent_0", "Why did you vote yes?"),
+            ("agent_2", "Who do you trust?"),
+        ):
+            self.assertTrue(
+                any(f"{asker_id} asked you: {question}" in prompt for prompt in prompts)
+            )
+
+
+class EngineSeedTest(unittest.IsolatedAsyncioTestCase):
+    async def _run(self, seed: int) -> Engine:
+        # The engine seed doesn't cover the deck, which shuffles with the
+        # global random state
+        random.seed(seed)
+        engine = _engine(seed=seed)
+        questions = {"agent_0": ("agent_2", "Are you a crewmate?")}
+        with mock.patch.object(
+            OpenAIAgent, "generate_response", _scripted_agents(questions=questions)
+        ):
+            await asyncio.wait_for(engine.run(asyncio.Queue(), asyncio.Queue()), 30)
+        return engine
+
+    async def test_same_seed_replays_the_same_game(self) -> None:
+        first = await self._run(seed=3)
+        second = await self._run(seed=3)
+
+        self.assertEqual(
+            {aid: agent.role for aid, agent in first.agents_by_id.items()},
+            {aid: agent.role for aid, agent in second.agents_by_id.items()},
+        )
+        self.assertEqual(
+            [event.rendered for event in first.public_events],
+            [event.rendered for event in second.public_events],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
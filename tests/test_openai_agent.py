@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+os.environ.setdefault("AI_BACKEND", "openai")
+os.environ.setdefault("AI_MODEL_ID", "gpt-5-mini-2025-08-07")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("OPENAI_BASE_URL", "http://localhost:1")
+
+from src.agent import openai_agent
+from src.agent.openai_agent import OpenAIAgent, _window_messages
+from src.env import LLMSettings, settings
+from src.models import Agent, AgentRole, AIModel, UserInput
+
+
+def _completion(choice: bool) -> mock.Mock:
+    completion = mock.Mock()
+    completion.model_dump.return_value = {
+        "choices": [
+            {
+                "message": {
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": "call_0",
+                            "type": "function",
+                            "function": {
+                                "name": "vote-chancellor-yes-no",
+                                "arguments": json.dumps({"choice": choice}),
+                            },
+                        }
+                    ],
+                }
+            }
+        ]
+    }
+    return completion
+
+
+def _history(*messages: str) -> list[UserInput]:
+    return [
+        UserInput(history_type="user-input", user_message=message, timestamp=str(i))
+        for i, message in enumerate(messages)
+    ]
+
+
+class OpenAIAgentTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        # generate_response logs every request under ./logs
+        cwd = os.getcwd()
+        tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(tmp_dir.name)
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(os.chdir, cwd)
+
+        openai_agent._response_cache.clear()
+        self.addCleanup(openai_agent._response_cache.clear)
+
+        self.create = mock.AsyncMock(return_value=_completion(True))
+        client = mock.Mock()
+        client.chat.completions.create = self.create
+        patcher = mock.patch.object(
+            OpenAIAgent, "client", new_callable=mock.PropertyMock, return_value=client
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.agent = OpenAIAgent(
+            agent=Agent(agent_id="agent_0", role=AgentRole.CREWMATE),
+            ai_model=AIModel.OPENAI_GPT_5_MINI,
+        )
+
+    def _settings(self, **kwargs) -> None:
+        patcher = mock.patch.object(settings, "llm", LLMSettings(**kwargs))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _vote(self, history: list[UserInput]):
+        return await self.agent.generate_response(
+            history, allowed_tools=["vote-chancellor-yes-no"]
+        )
+
+    async def test_response_cache_disabled_by_default(self) -> None:
+        self._settings()
+        history = _history("rules", "Vote?")
+
+        await self._vote(history)
+        await self._vote(history)
+
+        self.assertEqual(self.create.await_count, 2)
+
+    async def test_response_cache_reuses_identical_requests(self) -> None:
+        self._settings(response_cache_size=1)
+
+        first = await self._vote(_history("rules", "Vote?"))
+        second = await self._vote(_history("rules", "Vote?"))
+        self.assertEqual(self.create.await_count, 1)
+        self.assertIs(second, first)
+        self.assertTrue(second.hydrated_tool_calls[0].choice)
+
+        # A different request misses and evicts the only entry
+        await self._vote(_history("rules", "Vote again?"))
+        await self._vote(_history("rules", "Vote?"))
+        self.assertEqual(self.create.await_count, 3)
+
+    async def test_max_history_messages_windows_request(self) -> None:
+        self._settings(max_history_messages=2)
+
+        await self._vote(_history("rules", "one", "two", "three"))
+
+        messages = self.create.await_args.kwargs["messages"]
+        self.assertEqual(
+            [message["content"][0]["text"] for message in messages],
+            ["rules", "two", "three"],
+        )
+
+
+class WindowMessagesTest(unittest.TestCase):
+    def test_short_history_is_unchanged(self) -> None:
+        messages = [{"role": "system"}, {"role": "user"}]
+        self.assertIs(_window_messages(messages, 5), messages)
+
+    def test_keeps_first_message_and_skips_leading_tool_results(self) -> None:
+        messages = [
+            {"role": "system", "content": "rules"},
+            {"role": "user", "content": "0"},
+            {"role": "assistant", "content": "1"},
+            {"role": "tool", "content": "2"},
+            {"role": "user", "content": "3"},
+            {"role": "assistant", "content": "4"},
+        ]
+
+        window = _window_messages(messages, 3)
+
+        self.assertEqual(window[0], messages[0])
+        self.assertNotEqual(window[1]["role"], "tool")
+        self.assertEqual(window[1:], messages[4:])
+
+
+if __name__ == "__main__":
+    unittest.main()